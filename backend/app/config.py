@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+def _split_csv(raw: str) -> list[str]:
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+@dataclass(frozen=True)
+class AppSettings:
+    cors_origins: tuple[str, ...] = ("http://localhost:3000",)
+    allowed_hosts: tuple[str, ...] = ("localhost", "127.0.0.1", "testserver")
+    alembic_startup_timeout_seconds: int = 60
+    cleanup_interval_minutes: int = 5
+    ocr_enabled: bool = True
+    tesseract_config: str = ""
+    ocr_concurrency: int = 4
+    ocr_cache_size: int = 256
+    ocr_cache_ttl_seconds: float = 3600.0
+    ocr_page_concurrency: int = 4
+    translate_concurrency: int = 8
+    translate_max_attempts: int = 3
+    translate_retry_backoff_seconds: float = 0.5
+    translation_cache_size: int = 1024
+    translation_cache_ttl_seconds: float = 3600.0
+    llm_cache_size: int = 256
+    llm_cache_ttl_seconds: float = 3600.0
+    llm_sem_cache_size: int = 256
+    llm_sem_cache_ttl_seconds: float = 3600.0
+
+    @classmethod
+    def from_env(cls) -> AppSettings:
+        # FRONTEND_URL may list several comma-separated origins; split once here.
+        origins = [origin.rstrip("/") for origin in _split_csv(os.getenv("FRONTEND_URL", "http://localhost:3000"))]
+        hosts = _split_csv(os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1"))
+        # Allow Starlette TestClient default host
+        if "testserver" not in hosts:
+            hosts.append("testserver")
+        return cls(
+            cors_origins=tuple(origins),
+            allowed_hosts=tuple(hosts),
+            alembic_startup_timeout_seconds=int(os.getenv("ALEMBIC_STARTUP_TIMEOUT_SECONDS", "60")),
+            cleanup_interval_minutes=int(os.getenv("CLEANUP_INTERVAL_MINUTES", "5")),
+            ocr_enabled=os.getenv("ENABLE_OCR", "1").strip() not in {"0", "false", "False"},
+            tesseract_config=os.getenv("TESSERACT_CONFIG", ""),
+            ocr_concurrency=max(1, int(os.getenv("OCR_CONCURRENCY", "4"))),
+            ocr_cache_size=max(0, int(os.getenv("OCR_CACHE_SIZE", "256"))),
+            ocr_cache_ttl_seconds=max(0.0, float(os.getenv("OCR_CACHE_TTL_SECONDS", "3600"))),
+            ocr_page_concurrency=max(1, int(os.getenv("OCR_PAGE_CONCURRENCY", str(min(4, os.cpu_count() or 1))))),
+            translate_concurrency=max(1, int(os.getenv("TRANSLATE_CONCURRENCY", "8"))),
+            translate_max_attempts=max(1, int(os.getenv("TRANSLATE_MAX_ATTEMPTS", "3"))),
+            translate_retry_backoff_seconds=max(0.0, float(os.getenv("TRANSLATE_RETRY_BACKOFF_SECONDS", "0.5"))),
+            translation_cache_size=max(0, int(os.getenv("TRANSLATION_CACHE_SIZE", "1024"))),
+            translation_cache_ttl_seconds=max(0.0, float(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", "3600"))),
+            llm_cache_size=max(0, int(os.getenv("LLM_CACHE_SIZE", "256"))),
+            llm_cache_ttl_seconds=max(0.0, float(os.getenv("LLM_CACHE_TTL_S", "3600"))),
+            llm_sem_cache_size=max(0, int(os.getenv("LLM_SEM_CACHE_MAX", "256"))),
+            llm_sem_cache_ttl_seconds=max(0.0, float(os.getenv("LLM_SEM_CACHE_TTL_S", "3600"))),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> AppSettings:
+    """Return process-wide app settings, parsed from the environment on first use.
+
+    Tests that change the environment should call `get_settings.cache_clear()`.
+    """
+    return AppSettings.from_env()
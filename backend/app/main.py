@@ -3,16 +3,17 @@ import logging
 import os
 import sys
 import time
-import uuid
 from contextlib import asynccontextmanager
+from os import urandom
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.responses import Response
 
+from .config import get_settings
 from .db.session import build_database_manager
 from .routers.audit import router as audit_router
 from .routers.auth import router as auth_router
@@ -23,8 +24,29 @@ from .routers.reports import router as reports_router
 from .routers.notifications import router as notifications_router
 from .routers.threads import router as threads_router
 from .routers.translate import router as translate_router
+from .services import llm, ocr, ocr_scheduler
 from .services.reports import cleanup_expired_shares
 
+# Configure basic structured-ish logging once per process, not per middleware instance
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+# Scope key RequestIDMiddleware uses to hand the request ID to the logging middleware
+REQUEST_ID_SCOPE_KEY = "x_request_id"
+_REQUEST_LOG_TEMPLATE = "http_request method=%s path=%s status=%s duration_ms=%d request_id=%s"
+
+API_V1_PREFIX = "/api/v1"
+API_V1_ROUTERS = (
+    health_router,
+    auth_router,
+    parse_router,
+    interpret_router,
+    audit_router,
+    reports_router,
+    threads_router,
+    notifications_router,
+    translate_router,
+)
+
 
 async def _run_alembic_migrations(project_root: str, timeout: int) -> None:
     process = await asyncio.create_subprocess_exec(
@@ -54,10 +76,10 @@ async def _run_alembic_migrations(project_root: str, timeout: int) -> None:
 async def app_lifespan(app: FastAPI):
     # Ensure migrations are applied on startup so required tables (e.g. roles) exist.
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    settings = get_settings()
     try:
         logging.info('Running alembic migrations at startup...')
-        timeout = int(os.getenv('ALEMBIC_STARTUP_TIMEOUT_SECONDS', '60'))
-        await _run_alembic_migrations(project_root, timeout=timeout)
+        await _run_alembic_migrations(project_root, timeout=settings.alembic_startup_timeout_seconds)
         logging.info('Alembic migrations applied successfully.')
     except Exception:
         logging.exception('Failed to apply migrations on startup')
@@ -78,11 +100,10 @@ async def app_lifespan(app: FastAPI):
     # Valid values: positive whole-number minutes; lower values increase scheduler and
     # database activity, while higher values leave expired shares in place longer.
     # For production, choose an interval that balances prompt cleanup with operational load.
-    cleanup_interval = int(os.getenv('CLEANUP_INTERVAL_MINUTES', '5'))
     scheduler.add_job(
         scheduled_cleanup,
         'interval',
-        minutes=cleanup_interval,
+        minutes=settings.cleanup_interval_minutes,
         id='cleanup-expired-shares',
         name='Cleanup expired shares',
     )
@@ -90,22 +111,24 @@ async def app_lifespan(app: FastAPI):
     app.state.scheduler = scheduler
 
     try:
+        # Probe the OCR backend once at startup (on an OCR worker) instead of on the first scanned
+        # upload, and say in the logs when scanned uploads will come back empty. Skipped when OCR
+        # is switched off on purpose.
+        if settings.ocr_enabled and not await ocr_scheduler.run_blocking(ocr._ocr_available):
+            logging.warning('OCR backend unavailable; scanned PDFs and images will return no text.')
         yield
     finally:
         scheduler.shutdown()
+        ocr_scheduler.shutdown()
+        await llm.aclose_openai_client()
         await app.state.database.dispose()
 
 
-def get_frontend_origin() -> str:
-    return os.getenv("FRONTEND_URL", "http://localhost:3000").rstrip("/")
-
-
 class PHIScrubbedLoggingMiddleware:
     def __init__(self, app: FastAPI) -> None:
         self.app = app
-        # Configure basic structured-ish logging
-        logging.basicConfig(level=logging.INFO, format="%(message)s")
         self.logger = logging.getLogger("reportrx.backend")
+        self._log = self.logger.info
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
@@ -113,87 +136,97 @@ class PHIScrubbedLoggingMiddleware:
 
         method = scope.get("method")
         path = scope.get("path")
-        start = time.perf_counter()
-        status_code_holder = {"status": None}
-        request_id_holder = {"rid": None}
+        start = time.monotonic_ns()
+        status: int | None = None
 
         async def send_wrapper(message):
+            nonlocal status
             if message["type"] == "http.response.start":
-                status_code_holder["status"] = message.get("status", 0)
-                # Try to read request id from headers written by RequestIDMiddleware
-                headers = message.get("headers") or []
-                for k, v in headers:
-                    if k.decode().lower() == "x-request-id":
-                        request_id_holder["rid"] = v.decode()
+                status = message.get("status", 0)
             await send(message)
 
         try:
             await self.app(scope, receive, send_wrapper)
         finally:
-            duration_ms = int((time.perf_counter() - start) * 1000)
-            # If RequestIDMiddleware hasn't written yet, try to derive from scope
-            if not request_id_holder["rid"]:
-                for k, v in scope.get("headers", []):
-                    if k.decode().lower() == "x-request-id":
-                        request_id_holder["rid"] = v.decode()
-            # Intentionally avoid logging headers, bodies, or files
-            self.logger.info(
-                {
-                    "event": "http_request",
-                    "method": method,
-                    "path": path,
-                    "status": status_code_holder["status"],
-                    "duration_ms": duration_ms,
-                    "request_id": request_id_holder["rid"],
-                }
-            )
-
-
-def get_allowed_hosts() -> list[str]:
-    raw = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1").strip()
-    hosts = [h.strip() for h in raw.split(",") if h.strip()]
-    # Allow Starlette TestClient default host
-    if "testserver" not in hosts:
-        hosts.append("testserver")
-    return hosts
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        response = await call_next(request)
-        # Conservative default security headers; keep PHI out of logs separately
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
-        response.headers.setdefault("X-Frame-Options", "DENY")
-        response.headers.setdefault("Referrer-Policy", "no-referrer")
-        response.headers.setdefault("Permissions-Policy", "interest-cohort=()")
-        return response
-
-
-class RequestIDMiddleware(BaseHTTPMiddleware):
+            duration_ms = (time.monotonic_ns() - start) // 1_000_000
+            # Intentionally avoid logging headers, bodies, or files. The template is only
+            # formatted when INFO is enabled, so filtered-out records cost nothing.
+            if self.logger.isEnabledFor(logging.INFO):
+                self._log(
+                    _REQUEST_LOG_TEMPLATE,
+                    method,
+                    path,
+                    status,
+                    duration_ms,
+                    # RequestIDMiddleware runs inside this one and records the ID on the scope
+                    scope.get(REQUEST_ID_SCOPE_KEY),
+                )
+
+
+class SecurityHeadersMiddleware:
+    def __init__(self, app: FastAPI) -> None:
+        self.app = app
+        # Conservative default security headers; keep PHI out of logs separately.
+        # Pre-encoded (lower-case name, value) pairs so nothing is encoded per response.
+        self._extra = [
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-frame-options", b"DENY"),
+            (b"referrer-policy", b"no-referrer"),
+            (b"permissions-policy", b"interest-cohort=()"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                # ASGI header names are already lower-case bytes
+                present = {name for name, _ in headers}
+                headers.extend(item for item in self._extra if item[0] not in present)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class RequestIDMiddleware:
     """Attach a request ID to each response and propagate incoming X-Request-ID.
 
     - If the client supplies X-Request-ID, echo it back.
-    - Otherwise, generate a UUID4 and set X-Request-ID.
+    - Otherwise, generate a random 128-bit hex ID and set X-Request-ID.
     The ID is included in logs by PHIScrubbedLoggingMiddleware.
     """
 
-    async def dispatch(self, request, call_next):
-        incoming = request.headers.get("x-request-id")
-        rid = incoming or uuid.uuid4().hex
-        response = await call_next(request)
-        response.headers.setdefault("X-Request-ID", rid)
-        return response
+    def __init__(self, app: FastAPI) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        incoming = Headers(scope=scope).get("x-request-id")
+        rid = incoming or urandom(16).hex()
+        scope[REQUEST_ID_SCOPE_KEY] = rid
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).setdefault("X-Request-ID", rid)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
 
 
 def create_app() -> FastAPI:
+    settings = get_settings()
     app = FastAPI(title="ReportX API", version="0.1.0", lifespan=app_lifespan)
     app.state.database = build_database_manager()
 
-    # CORS: only allow the configured frontend origin
-    frontend_origin = get_frontend_origin()
+    # CORS: only allow the configured frontend origin(s)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[frontend_origin],
+        allow_origins=list(settings.cors_origins),
         allow_credentials=False,
         allow_methods=["GET", "POST", "OPTIONS"],
         allow_headers=["*"],
@@ -206,19 +239,12 @@ def create_app() -> FastAPI:
     app.add_middleware(PHIScrubbedLoggingMiddleware)
 
     # Security hardening
-    app.add_middleware(TrustedHostMiddleware, allowed_hosts=get_allowed_hosts())
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=list(settings.allowed_hosts))
     app.add_middleware(SecurityHeadersMiddleware)
 
     # Routers
-    app.include_router(health_router, prefix="/api/v1")
-    app.include_router(auth_router, prefix="/api/v1")
-    app.include_router(parse_router, prefix="/api/v1")
-    app.include_router(interpret_router, prefix="/api/v1")
-    app.include_router(audit_router, prefix="/api/v1")
-    app.include_router(reports_router, prefix="/api/v1")
-    app.include_router(threads_router, prefix="/api/v1")
-    app.include_router(notifications_router, prefix="/api/v1")
-    app.include_router(translate_router, prefix="/api/v1")
+    for router in API_V1_ROUTERS:
+        app.include_router(router, prefix=API_V1_PREFIX)
 
     @app.get("/", include_in_schema=False)
     async def root(_: Request) -> Response:
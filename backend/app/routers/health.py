@@ -2,7 +2,11 @@ from fastapi import APIRouter
 
 router = APIRouter()
 
+# Liveness payload never changes; build it once instead of per probe
+_HEALTH_OK = {"status": "ok"}
+
 
 @router.get("/health", tags=["health"])
-def health():
-    return {"status": "ok"}
+async def health():
+    # async so probes are answered on the event loop without a threadpool hop
+    return _HEALTH_OK
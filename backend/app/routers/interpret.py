@@ -1,26 +1,19 @@
 from __future__ import annotations
 
-from typing import Any
+from fastapi import APIRouter, Body, HTTPException
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-
-from app.services.llm import ParsedRowIn, interpret_rows
+from app.services.llm import InterpretationOut, ParsedRowIn, interpret_rows
 
 router = APIRouter()
 
 
-class InterpretRequest(BaseModel):
-    rows: list[ParsedRowIn] = Field(default_factory=list)
-
-
 @router.post("/interpret")
-async def interpret_endpoint(payload: InterpretRequest) -> dict[str, Any]:
-    rows = payload.rows or []
+async def interpret_endpoint(
+    rows: list[ParsedRowIn] = Body(default_factory=list, embed=True),
+) -> dict[str, InterpretationOut]:
     if not rows:
         raise HTTPException(status_code=400, detail="rows must be a non-empty array")
 
     result, _ = await interpret_rows(rows)
-    return {
-        "interpretation": result.model_dump(),
-    }
+    # Hand the model to FastAPI so pydantic serializes it once, straight to JSON bytes
+    return {"interpretation": result}
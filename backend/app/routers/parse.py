@@ -1,11 +1,8 @@
 from __future__ import annotations
 
-from typing import Any
-
 from fastapi import APIRouter, File, HTTPException, Request, UploadFile
 
-from app.services.ocr import extract_text_from_image_bytes, extract_text_from_pdf_bytes
-from app.services.parser import extract_report_date, parse_text
+from app.responses import ORJSONResponse
 from app.services.parse_pipeline import (
     ParseServiceError,
     build_parse_response,
@@ -13,17 +10,17 @@ from app.services.parse_pipeline import (
     extract_text_from_json_payload,
     extract_text_from_uploads,
 )
+from app.services.parser import extract_report_date
 
 router = APIRouter()
 
 
-@router.post("/parse")
+@router.post("/parse", response_class=ORJSONResponse)
 async def parse_endpoint(
     request: Request,
     file: UploadFile | None = File(default=None),
     files: list[UploadFile] | None = File(default=None),
-) -> dict[str, Any]:
-    content_type = request.headers.get("content-type", "").lower()
+) -> ORJSONResponse:
     try:
         content_length = int(request.headers.get("content-length", "0"))
     except Exception:
@@ -44,41 +41,17 @@ async def parse_endpoint(
             payload = await request.json()
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid JSON body.")
-        if not isinstance(payload, dict) or "text" not in payload:
-            raise HTTPException(status_code=400, detail="Body must include 'text'.")
-        text_content = str(payload.get("text") or "")
+        try:
+            text_content = extract_text_from_json_payload(request.headers.get("content-type", ""), payload)
+        except ParseServiceError as exc:
+            raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
 
     source_text = text_content or ""
-    rows, unparsed = parse_text(source_text)
-    observed_at = extract_report_date(source_text)
-    # Convert dataclasses to dicts
-    payload_rows = []
-    for i, r in enumerate(rows, start=1):
-        d = {
-            "id": f"r{i}",
-            "test_name": r.test_name,
-            "test_name_raw": r.test_name_raw,
-            "value": r.value,
-            "value_text": r.value_text or (str(r.value) if r.value is not None else None),
-            "value_num": r.value_num,
-            "unit": r.unit,
-            "unit_raw": r.unit_raw,
-            "reference_range": r.reference_range,
-            "comparator": r.comparator,
-            "flag": r.flag,
-            "confidence": r.confidence,
-            "page": r.page,
-            "bbox": r.bbox,
-            "raw_line": r.raw_line,
-        }
-        payload_rows.append(d)
-
-    return {
-        "rows": payload_rows,
-        "unparsed_lines": unparsed,
-        "unparsed": [{"page": None, "text": s} for s in unparsed],
-        "meta": {
-            "report_date": observed_at.isoformat() if observed_at else None,
-        },
-        "extracted_text": source_text,
-    }
+    observed_at = extract_report_date(source_text) if source_text.strip() else None
+    # Rows are plain dicts already; encode them once with orjson instead of jsonable_encoder + json.dumps
+    return ORJSONResponse(
+        build_parse_response(
+            source_text,
+            meta={"report_date": observed_at.isoformat() if observed_at else None},
+        )
+    )
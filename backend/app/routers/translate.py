@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import time
+import weakref
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from app.config import get_settings
+from app.responses import ORJSONResponse
 from app.services import llm as llm_service
+from app.services.llm_cache import get_translation_cache, translation_key
 
 router = APIRouter()
 
@@ -21,6 +25,129 @@ SUPPORTED_LANGUAGES: dict[str, str] = {
     "fr": "French",
 }
 
+# Languages a request can target; the English source is never translated
+_TRANSLATION_TARGETS: dict[str, str] = {
+    lang_code: lang_label for lang_code, lang_label in SUPPORTED_LANGUAGES.items() if lang_code != "en"
+}
+
+
+# Shared public meta keys from interpret + language; everything else stays server-side
+_PUBLIC_META_KEYS = frozenset(
+    {
+        "duration_ms",
+        "llm",
+        "attempts",
+        "ok",
+        "model",
+        "endpoint",
+        "status",
+        "usage",
+        "finish_reason",
+        "error",
+        "language",
+        "cached",
+    }
+)
+
+# LLM error codes that mean translation is not configured rather than failing upstream
+_UNAVAILABLE_ERROR_CODES = frozenset({"missing_api_key", "missing_openai_dependency"})
+
+# Upstream failures worth retrying server-side: throttling, timeouts and dropped connections
+_TRANSIENT_ERROR_CODES = frozenset(
+    {
+        "rate_limit",
+        "rate_limit_exceeded",
+        "RateLimitError",
+        "timeout",
+        "APITimeoutError",
+        "APIConnectionError",
+        "InternalServerError",
+        "ConnectError",
+        "ConnectTimeout",
+        "ReadTimeout",
+        "PoolTimeout",
+        "upstream_5xx",
+    }
+)
+_RETRY_BACKOFF_MAX_SECONDS = 8.0
+
+# One semaphore per event loop; asyncio primitives must not be shared across loops
+_translate_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _translate_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _translate_slots.get(loop)
+    if slots is None:
+        slots = _translate_slots[loop] = asyncio.Semaphore(get_settings().translate_concurrency)
+    return slots
+
+
+def _is_transient_failure(meta: dict[str, Any]) -> bool:
+    err = (meta or {}).get("error", {}) or {}
+    status_code = err.get("status")
+    if isinstance(status_code, int) and (status_code == 429 or status_code >= 500):
+        return True
+    return str(err.get("code") or "") in _TRANSIENT_ERROR_CODES
+
+
+async def _translate_with_retry(text: str, code: str, label: str) -> tuple[str | None, dict[str, Any]]:
+    """Call the LLM translator, retrying transient upstream failures with exponential backoff."""
+    settings = get_settings()
+    attempt = 0
+    while True:
+        attempt += 1
+        async with _translate_semaphore():
+            translation, meta = await llm_service.translate_summary(
+                text,
+                target_language=code,
+                language_label=label,
+            )
+        meta["attempts"] = attempt
+        if translation is not None or attempt >= settings.translate_max_attempts or not _is_transient_failure(meta):
+            return translation, meta
+        delay = settings.translate_retry_backoff_seconds * (2 ** (attempt - 1))
+        await asyncio.sleep(min(delay, _RETRY_BACKOFF_MAX_SECONDS))
+
+
+async def _translate_cached(text: str, code: str, label: str) -> tuple[str | None, dict[str, Any]]:
+    start = time.perf_counter()
+    cache = get_translation_cache()
+    key = translation_key(code, text)
+    hit = cache.get(key)
+    if hit is not None:
+        translation, meta = hit
+        # Report the hit itself, not the call that filled the cache: no tokens, no attempts
+        meta.pop("usage", None)
+        meta["attempts"] = 0
+        meta["duration_ms"] = int((time.perf_counter() - start) * 1000)
+        meta["cached"] = True
+        return translation, meta
+
+    translation, meta = await _translate_with_retry(text, code, label)
+    if translation:
+        cache.put(key, translation, meta)
+    return translation, meta
+
+
+def _public_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in meta.items() if key in _PUBLIC_META_KEYS}
+
+
+def _translation_error_response(meta: dict[str, Any], safe_meta: dict[str, Any]) -> ORJSONResponse:
+    err = (meta or {}).get("error", {}) or {}
+    if str(err.get("code") or "") in _UNAVAILABLE_ERROR_CODES:
+        return ORJSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Translation service unavailable", "meta": safe_meta},
+        )
+    return ORJSONResponse(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        content={"detail": "Translation failed", "meta": safe_meta},
+    )
+
 
 class TranslateRequest(BaseModel):
     text: str
@@ -35,28 +162,19 @@ async def translate_endpoint(payload: TranslateRequest) -> Any:
         raise HTTPException(status_code=400, detail="text must be a non-empty string")
 
     code = (payload.target_language or "").strip().lower()
-    if code not in SUPPORTED_LANGUAGES or code == "en":
+    if code not in _TRANSLATION_TARGETS:
         # We allow 'en' in the selector client-side but it produces no request.
         # If called directly with 'en', treat it as unsupported to avoid no-op calls.
         raise HTTPException(status_code=400, detail="unsupported target_language")
 
-    label = SUPPORTED_LANGUAGES[code]
+    label = _TRANSLATION_TARGETS[code]
     if payload.prefetch_all:
         async def _translate(code_item: str, label_item: str):
-            translation_item, meta_item = await llm_service.translate_summary(
-                text,
-                target_language=code_item,
-                language_label=label_item,
-            )
+            translation_item, meta_item = await _translate_cached(text, code_item, label_item)
             return code_item, translation_item, meta_item
 
-        translate_targets = [
-            (lang_code, lang_label)
-            for lang_code, lang_label in SUPPORTED_LANGUAGES.items()
-            if lang_code != "en"
-        ]
         results = await asyncio.gather(
-            *[_translate(lang_code, lang_label) for lang_code, lang_label in translate_targets],
+            *[_translate(lang_code, lang_label) for lang_code, lang_label in _TRANSLATION_TARGETS.items()],
             return_exceptions=False,
         )
 
@@ -65,23 +183,7 @@ async def translate_endpoint(payload: TranslateRequest) -> Any:
         requested_translation: str | None = None
         requested_meta: dict[str, Any] = {}
         for lang_code, translated_text, translated_meta in results:
-            per_language_meta[lang_code] = {
-                key: translated_meta.get(key)
-                for key in [
-                    "duration_ms",
-                    "llm",
-                    "attempts",
-                    "ok",
-                    "model",
-                    "endpoint",
-                    "status",
-                    "usage",
-                    "finish_reason",
-                    "error",
-                    "language",
-                ]
-                if key in translated_meta
-            }
+            per_language_meta[lang_code] = _public_meta(translated_meta)
             if translated_text:
                 translations[lang_code] = translated_text
             if lang_code == code:
@@ -89,95 +191,24 @@ async def translate_endpoint(payload: TranslateRequest) -> Any:
                 requested_meta = translated_meta
 
         if requested_translation is None:
-            err = (requested_meta or {}).get("error", {}) or {}
-            error_code = str(err.get("code") or "")
-            safe_requested_meta = {
-                key: requested_meta[key]
-                for key in [
-                    "duration_ms",
-                    "llm",
-                    "attempts",
-                    "ok",
-                    "model",
-                    "endpoint",
-                    "status",
-                    "usage",
-                    "finish_reason",
-                    "error",
-                    "language",
-                ]
-                if key in requested_meta
-            }
-            if error_code in {"missing_api_key", "missing_openai_dependency"}:
-                return JSONResponse(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    content={"detail": "Translation service unavailable", "meta": safe_requested_meta},
-                )
-            return JSONResponse(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                content={"detail": "Translation failed", "meta": safe_requested_meta},
-            )
+            return _translation_error_response(requested_meta, _public_meta(requested_meta))
 
         return {
             "language": code,
             "translation": requested_translation,
             "translations": translations,
             "meta": {
-                "requested": {
-                    key: requested_meta[key]
-                    for key in [
-                        "duration_ms",
-                        "llm",
-                        "attempts",
-                        "ok",
-                        "model",
-                        "endpoint",
-                        "status",
-                        "usage",
-                        "finish_reason",
-                        "error",
-                        "language",
-                    ]
-                    if key in requested_meta
-                },
+                "requested": _public_meta(requested_meta),
                 "prefetch": per_language_meta,
             },
         }
 
-    translation, meta = await llm_service.translate_summary(
-        text,
-        target_language=code,
-        language_label=label,
-    )
+    translation, meta = await _translate_cached(text, code, label)
 
-    # Shared public meta keys from interpret + language
-    public_meta_keys = [
-        "duration_ms",
-        "llm",
-        "attempts",
-        "ok",
-        "model",
-        "endpoint",
-        "status",
-        "usage",
-        "finish_reason",
-        "error",
-        "language",
-    ]
-    safe_meta = {k: meta[k] for k in public_meta_keys if k in meta}
+    safe_meta = _public_meta(meta)
 
     if translation is None:
-        err = (meta or {}).get("error", {}) or {}
-        code = str(err.get("code") or "")
-        if code in {"missing_api_key", "missing_openai_dependency"}:
-            return JSONResponse(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                content={"detail": "Translation service unavailable", "meta": safe_meta},
-            )
-        return JSONResponse(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            content={"detail": "Translation failed", "meta": safe_meta},
-        )
+        return _translation_error_response(meta, safe_meta)
 
     return {
         "language": code,
@@ -0,0 +1,89 @@
+"""In-process TTL caches for LLM output.
+
+Users toggling between languages on the same summary re-request identical translations, and
+retries or repeated reports re-submit identical interpretation rows and question prompts; hits are served from
+memory instead of another paid LLM round-trip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+from app.config import get_settings
+
+
+def translation_key(target_language: str, text: str) -> str:
+    return hashlib.sha1(f"{target_language}|{text}".encode("utf-8")).hexdigest()
+
+
+def prompt_key(model: str, endpoint: str, prompt: str) -> str:
+    return hashlib.blake2b(f"{model}|{endpoint}|{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def signature_key(model: str, endpoint: str, signature: tuple[Any, ...]) -> str:
+    return hashlib.blake2b(repr((model, endpoint, signature)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMCache:
+    """LRU of (text, meta) pairs whose entries expire `ttl_seconds` after insertion."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        # Only touched from the event loop without awaiting in between, so no lock is needed
+        self._entries: OrderedDict[str, tuple[float, str, dict[str, Any]]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text, meta = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text, dict(meta)
+
+    def put(self, key: str, text: str, meta: dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, text, dict(meta))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def get_translation_cache() -> LLMCache:
+    settings = get_settings()
+    return LLMCache(settings.translation_cache_size, settings.translation_cache_ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_interpretation_cache() -> LLMCache:
+    settings = get_settings()
+    return LLMCache(settings.llm_cache_size, settings.llm_cache_ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> LLMCache:
+    """Second-tier interpretation cache keyed by a canonical row signature rather than the exact rows."""
+    settings = get_settings()
+    return LLMCache(settings.llm_sem_cache_size, settings.llm_sem_cache_ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_questions_cache() -> LLMCache:
+    """Clinician-question replies keyed by prompt; shares the interpretation cache's size and TTL."""
+    settings = get_settings()
+    return LLMCache(settings.llm_cache_size, settings.llm_cache_ttl_seconds)
@@ -1,18 +1,44 @@
 from __future__ import annotations
 
 import io
-import os
+import logging
+from functools import lru_cache
 
 import fitz  # PyMuPDF
 from PIL import Image
 
+from app.config import get_settings
+from app.services import ocr_scheduler
+from app.services.ocr_cache import cache_key, get_ocr_cache
+
+logger = logging.getLogger("reportrx.backend")
+
+# Text layers shorter than this are treated as scanned pages (e.g. only a header or page number)
+MIN_TEXT_LAYER_CHARS = 40
+
+# MuPDF's font/glyph/resource store is process-wide and already shared across documents. Its
+# warning buffer is process-wide too and grows with every repaired PDF, so don't echo warnings
+# to stderr; _drain_mupdf_warnings() logs and clears them after each document instead.
+fitz.TOOLS.mupdf_display_errors(False)
+fitz.TOOLS.mupdf_display_warnings(False)
+
+
+def _drain_mupdf_warnings() -> None:
+    warnings = fitz.TOOLS.mupdf_warnings(reset=True)
+    if warnings:
+        logger.debug("mupdf_warnings %s", warnings.replace("\n", "; "))
+
 
 def _ocr_enabled() -> bool:
     """Check if OCR is enabled via env flag (default: enabled)."""
-    return os.getenv("ENABLE_OCR", "1").strip() not in {"0", "false", "False"}
+    return get_settings().ocr_enabled
 
 
+@lru_cache(maxsize=1)
 def _ocr_available() -> bool:
+    # Cached: probing pytesseract spawns `tesseract --version`, and the install can't change at runtime
+    if ocr_scheduler.tesserocr_available():
+        return True
     # pytesseract import is lazy to allow running without OCR installed
     try:
         import pytesseract  # type: ignore
@@ -23,9 +49,15 @@ def _ocr_available() -> bool:
 
 
 def _do_ocr_image(img: Image.Image, lang: str | None = None) -> str:
+    config = get_settings().tesseract_config
+    if not config:
+        # Preloaded per-worker Tesseract API when tesserocr is installed
+        text = ocr_scheduler.recognize(img, lang=lang)
+        if text is not None:
+            return text
+
     import pytesseract  # type: ignore
 
-    config = os.getenv("TESSERACT_CONFIG", "")
     kwargs = {}
     if lang:
         kwargs["lang"] = lang
@@ -36,11 +68,45 @@ def _do_ocr_image(img: Image.Image, lang: str | None = None) -> str:
 def extract_text_from_image_bytes(data: bytes, lang: str | None = None) -> str:
     if not (_ocr_enabled() and _ocr_available()):
         return ""
+    cache = get_ocr_cache()
+    key = cache_key(data, "image", lang)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
     try:
         img = Image.open(io.BytesIO(data))
     except Exception:
         return ""
-    return _do_ocr_image(img, lang=lang)
+    text = _do_ocr_image(img, lang=lang)
+    cache.put(key, text)
+    return text
+
+
+def _render_pdf_page(page: fitz.Page) -> Image.Image:
+    # Build the PIL image straight from the pixmap samples; no PNG encode/decode round-trip.
+    # Render 8-bit grayscale: Tesseract converts colour input to gray before binarizing anyway, so
+    # this skips two thirds of the pixel bytes. MuPDF's gray conversion is not Leptonica's, so text
+    # should match on typical scans but can differ slightly on faint or coloured print.
+    pix = page.get_pixmap(dpi=200, colorspace=fitz.csGRAY, alpha=False)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def _ocr_rendered_page(img: Image.Image, lang: str | None) -> str | None:
+    try:
+        return (_do_ocr_image(img, lang=lang) or "").strip()
+    except Exception:
+        # If OCR fails for this page, the caller falls back to its text layer; None tells it
+        # the result is degraded and must not be cached
+        return None
+
+
+def _alpha_num_ratio(s: str) -> float:
+    letters = sum(1 for ch in s if ch.isalpha())
+    digits = sum(1 for ch in s if ch.isdigit())
+    if digits == 0:
+        # If there are no digits, treat as sufficiently alphabetic
+        return float("inf") if letters > 0 else 0.0
+    return letters / digits
 
 
 def extract_text_from_pdf_bytes(
@@ -52,51 +118,57 @@ def extract_text_from_pdf_bytes(
     Extract text from a PDF.
 
     Strategy:
-    - Prefer text layer for each page when it has sufficient alphabetic content.
-    - If a page's text layer looks number-heavy (alphabetic-to-numeric char ratio < 0.4),
-      and OCR is enabled/available, run OCR for that page and prefer the OCR text.
-    - If a page has no text layer at all, fall back to OCR for that page (when enabled).
+    - Use the embedded text layer for each page when it has at least MIN_TEXT_LAYER_CHARS
+      characters and sufficient alphabetic content; such pages never touch Tesseract.
+    - If a page's text layer is missing or shorter than MIN_TEXT_LAYER_CHARS (a scanned page,
+      possibly with a stray header), or looks number-heavy (alphabetic-to-numeric char
+      ratio < 0.4), and OCR is enabled/available, OCR that page and prefer the OCR text.
+      Such pages are rendered one by one and then OCR'd in parallel on the page pool.
+    - If OCR fails or finds nothing, keep whatever the text layer had. A result with a failed
+      OCR page is not cached, so a re-upload retries it.
+
+    Each page's decision is logged at DEBUG on "reportrx.backend" to help tune the threshold.
     """
-    text_parts: list[str] = []
-
-    def _alpha_num_ratio(s: str) -> float:
-        letters = sum(1 for ch in s if ch.isalpha())
-        digits = sum(1 for ch in s if ch.isdigit())
-        if digits == 0:
-            # If there are no digits, treat as sufficiently alphabetic
-            return float("inf") if letters > 0 else 0.0
-        return letters / digits
-
+    use_ocr = _ocr_enabled() and _ocr_available()
+    cache = get_ocr_cache()
+    key = cache_key(data, "pdf", ocr_lang, max_pages, use_ocr)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    layers: list[str] = []
+    # (page index, rendered image) for pages that need OCR
+    scanned: list[tuple[int, Image.Image]] = []
     try:
-        with fitz.open(stream=io.BytesIO(data), filetype="pdf") as doc:
-            use_ocr = _ocr_enabled() and _ocr_available()
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            # PyMuPDF documents are not thread-safe, so read and render pages sequentially here
             for i, page in enumerate(doc):
                 if i >= max_pages:
                     break
                 t = (page.get_text("text") or "").strip()
-                if not t:
-                    if use_ocr:
-                        pix = page.get_pixmap(dpi=200)
-                        img = Image.open(io.BytesIO(pix.tobytes("png")))
-                        t_ocr = _do_ocr_image(img, lang=ocr_lang)
-                        text_parts.append(t_ocr)
-                    # else, append nothing for this page
-                    continue
-
-                # Heuristic: if text layer is number-heavy, prefer OCR
-                if use_ocr and _alpha_num_ratio(t) < 0.4:
+                layers.append(t)
+                if use_ocr and (len(t) < MIN_TEXT_LAYER_CHARS or _alpha_num_ratio(t) < 0.4):
                     try:
-                        pix = page.get_pixmap(dpi=200)
-                        img = Image.open(io.BytesIO(pix.tobytes("png")))
-                        t_ocr = (_do_ocr_image(img, lang=ocr_lang) or "").strip()
-                        if t_ocr:
-                            text_parts.append(t_ocr)
-                            continue
+                        scanned.append((i, _render_pdf_page(page)))
                     except Exception:
-                        # If OCR fails for this page, fall back to text layer
                         pass
-
-                text_parts.append(t)
-            return "\n".join(text_parts)
     except Exception:
         return ""
+    finally:
+        _drain_mupdf_warnings()
+
+    # Tesseract work for scanned pages runs in parallel on the page pool
+    ocr_texts = ocr_scheduler.map_pages(lambda item: _ocr_rendered_page(item[1], ocr_lang), scanned)
+    page_ocr = {i: t_ocr for (i, _img), t_ocr in zip(scanned, ocr_texts) if t_ocr}
+
+    text_parts: list[str] = []
+    for i, layer in enumerate(layers):
+        t = page_ocr.get(i, layer)
+        decision = "ocr" if i in page_ocr else "text"
+        logger.debug("pdf_page page=%d text_layer_chars=%d decision=%s", i + 1, len(layer), decision)
+        if t:
+            text_parts.append(t)
+    text = "\n".join(text_parts)
+    if all(t_ocr is not None for t_ocr in ocr_texts):
+        cache.put(key, text)
+    return text
@@ -0,0 +1,65 @@
+"""In-process TTL LRU cache of extracted upload text, keyed by file content.
+
+Re-uploads of the same PDF/image (frontend retries, users re-running a report) are served
+from memory instead of re-running PyMuPDF and Tesseract. Entries are report text, so they
+expire instead of living for the whole process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from app.config import get_settings
+
+
+def cache_key(data: bytes, *parts: object) -> str:
+    return "|".join([hashlib.sha256(data).hexdigest(), *(str(part) for part in parts)])
+
+
+class OcrCache:
+    """LRU of extracted text whose entries expire `ttl_seconds` after insertion."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Extraction runs on OCR worker threads, so guard with a thread lock
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def get_ocr_cache() -> OcrCache:
+    settings = get_settings()
+    return OcrCache(settings.ocr_cache_size, settings.ocr_cache_ttl_seconds)
@@ -0,0 +1,89 @@
+"""Process-wide worker pool for blocking PDF rendering and OCR.
+
+Every upload's extraction runs on one bounded thread pool (OCR_CONCURRENCY workers), so
+concurrent requests share workers instead of each starting their own. When the optional
+`tesserocr` binding is installed, each worker thread also keeps a preloaded Tesseract API per
+language, skipping the per-image `tesseract` process start and language-pack load that
+pytesseract pays.
+
+Scanned PDF pages are OCR'd on a second, page-level pool (OCR_PAGE_CONCURRENCY workers). It is
+separate so an upload worker waiting on its pages can never starve the pool it is running on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, TypeVar
+
+from PIL import Image
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+_worker_state = threading.local()
+
+
+@lru_cache(maxsize=1)
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=get_settings().ocr_concurrency, thread_name_prefix="ocr-worker")
+
+
+@lru_cache(maxsize=1)
+def get_page_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=get_settings().ocr_page_concurrency, thread_name_prefix="ocr-page")
+
+
+def map_pages(fn: Callable[[Any], T], items: list[Any]) -> list[T]:
+    """Apply a blocking per-page function across the page pool, preserving input order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    return list(get_page_executor().map(fn, items))
+
+
+async def run_blocking(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking extraction call on the shared OCR pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+
+
+def _thread_api(lang: str) -> Any | None:
+    apis: dict[str, Any | None] | None = getattr(_worker_state, "apis", None)
+    if apis is None:
+        apis = _worker_state.apis = {}
+    if lang not in apis:
+        # tesserocr is optional; without it callers fall back to pytesseract
+        try:
+            import tesserocr  # type: ignore
+
+            apis[lang] = tesserocr.PyTessBaseAPI(lang=lang)
+        except Exception:
+            apis[lang] = None
+    return apis[lang]
+
+
+def tesserocr_available() -> bool:
+    return _thread_api("eng") is not None
+
+
+def recognize(img: Image.Image, lang: str | None = None) -> str | None:
+    """OCR an image with this thread's preloaded Tesseract API.
+
+    Returns None when no preloaded API can be created, so the caller can use pytesseract.
+    """
+    api = _thread_api(lang or "eng")
+    if api is None:
+        return None
+    api.SetImage(img)
+    return api.GetUTF8Text() or ""
+
+
+def shutdown() -> None:
+    for accessor in (get_executor, get_page_executor):
+        if accessor.cache_info().currsize:
+            accessor().shutdown(wait=False, cancel_futures=True)
+            accessor.cache_clear()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import re
 from dataclasses import dataclass
-from typing import Any, Protocol
+from functools import partial
+from typing import Any, Final, Protocol
 
+from app.services import ocr_scheduler
 from app.services.ocr import extract_text_from_image_bytes, extract_text_from_pdf_bytes
 from app.services.parser import parse_text
 
@@ -11,7 +15,7 @@ class UploadLike(Protocol):
     filename: str | None
     content_type: str | None
 
-    async def read(self) -> bytes: ...
+    async def read(self, size: int = -1) -> bytes: ...
 
 
 class ParseServiceError(Exception):
@@ -21,11 +25,30 @@ class ParseServiceError(Exception):
         self.status_code = status_code
 
 
+BYTES_PER_MB: Final[int] = 1024 * 1024
+READ_CHUNK_BYTES: Final[int] = BYTES_PER_MB
+MAX_FILE_BYTES: Final[int] = 500 * BYTES_PER_MB
+MAX_PDF_PAGES: Final[int] = 5
+MAX_FILES: Final[int] = 5
+# Uploads in one request read and extracted at once; bounds buffered bytes to this many files
+MAX_CONCURRENT_UPLOADS: Final[int] = 2
+
+PDF_CONTENT_TYPES = frozenset({"application/pdf", "application/x-pdf"})
+IMAGE_CONTENT_TYPES = frozenset({"image/png", "image/x-png", "image/jpeg", "image/jpg", "image/pjpeg"})
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+# Anchored at the start of the header so a parameter like "text/plain; x=application/json" doesn't match
+_JSON_CONTENT_TYPE_RE = re.compile(r"application/json\b", re.IGNORECASE)
+
+
 @dataclass(frozen=True)
 class ParseConfig:
-    max_file_bytes: int = 500 * 1024 * 1024
-    max_pdf_pages: int = 5
-    max_files: int = 5
+    max_file_bytes: int = MAX_FILE_BYTES
+    max_pdf_pages: int = MAX_PDF_PAGES
+    max_files: int = MAX_FILES
+
+
+# Shared default so requests without an explicit config don't build a new one each time
+DEFAULT_PARSE_CONFIG: Final[ParseConfig] = ParseConfig()
 
 
 def collect_uploads(
@@ -41,23 +64,26 @@ def collect_uploads(
 
 
 def extract_text_from_json_payload(content_type: str, payload: Any) -> str:
-    if "application/json" not in (content_type or "").lower():
+    if not _JSON_CONTENT_TYPE_RE.match((content_type or "").strip()):
         raise ParseServiceError('Send a PDF file or JSON {"text": "..."}."', 400)
     if not isinstance(payload, dict) or "text" not in payload:
         raise ParseServiceError("Body must include 'text'.", 400)
     return str(payload.get("text") or "")
 
 
-def _is_pdf_upload(upload: UploadLike) -> bool:
-    return "pdf" in (upload.content_type or "application/octet-stream").lower()
-
-
-def _is_supported_image_upload(upload: UploadLike) -> bool:
-    content_type = (upload.content_type or "application/octet-stream").lower()
-    if content_type.startswith("image/") and any(token in content_type for token in ("png", "jpeg", "jpg")):
-        return True
+def _upload_kind(upload: UploadLike) -> str | None:
+    """Classify an upload as "pdf" or "image" by content type, then by filename extension."""
+    content_type = (upload.content_type or "").partition(";")[0].strip().lower()
+    if content_type in PDF_CONTENT_TYPES:
+        return "pdf"
+    if content_type in IMAGE_CONTENT_TYPES:
+        return "image"
     filename = (upload.filename or "").lower()
-    return filename.endswith((".png", ".jpg", ".jpeg"))
+    if filename.endswith(".pdf"):
+        return "pdf"
+    if filename.endswith(IMAGE_EXTENSIONS):
+        return "image"
+    return None
 
 
 async def extract_text_from_uploads(
@@ -66,7 +92,7 @@ async def extract_text_from_uploads(
     content_length: int | None,
     config: ParseConfig | None = None,
 ) -> str:
-    active_config = config or ParseConfig()
+    active_config = config or DEFAULT_PARSE_CONFIG
     if len(uploads) > active_config.max_files:
         raise ParseServiceError(f"Too many files (max {active_config.max_files}).", 413)
 
@@ -75,16 +101,14 @@ async def extract_text_from_uploads(
         raise ParseServiceError(
             (
                 f"Payload too large (max {active_config.max_files} files, "
-                f"{active_config.max_file_bytes // (1024 * 1024)}MB each)."
+                f"{active_config.max_file_bytes // BYTES_PER_MB}MB each)."
             ),
             413,
         )
 
-    extracted_parts: list[str] = []
-    for upload in uploads:
-        is_pdf = _is_pdf_upload(upload)
-        is_image = _is_supported_image_upload(upload)
-        if not (is_pdf or is_image):
+    kinds = [_upload_kind(upload) for upload in uploads]
+    for upload, kind in zip(uploads, kinds):
+        if kind is None:
             raise ParseServiceError(
                 (
                     f"Unsupported file type for {upload.filename or 'upload'}. "
@@ -93,35 +117,72 @@ async def extract_text_from_uploads(
                 400,
             )
 
-        data = await upload.read()
-        if len(data) > active_config.max_file_bytes:
+    # Files are read and OCR'd concurrently (a few at a time); gather() keeps results in upload order.
+    limit = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+
+    async def extract_one(upload: UploadLike, kind: str) -> str:
+        async with limit:
+            return await _extract_upload_text(upload, kind, active_config)
+
+    tasks = [asyncio.create_task(extract_one(upload, kind)) for upload, kind in zip(uploads, kinds)]
+    try:
+        texts = await asyncio.gather(*tasks)
+    except BaseException:
+        # One upload failed (or the request was cancelled): stop the rest instead of letting them
+        # read and OCR in the background, and collect their outcomes so none go unretrieved
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return "\n".join(normalized for text in texts if (normalized := (text or "").strip()))
+
+
+async def _read_bounded(upload: UploadLike, limit: int) -> bytearray:
+    """Read an upload in chunks, failing as soon as it grows past `limit` bytes.
+
+    The buffer is returned as-is: PyMuPDF, PIL and hashlib all accept a bytearray, and
+    copying it into `bytes` would briefly hold every upload in memory twice.
+    """
+    buffer = bytearray()
+    while chunk := await upload.read(READ_CHUNK_BYTES):
+        if len(buffer) + len(chunk) > limit:
             raise ParseServiceError(
-                (
-                    f"{upload.filename or 'file'} exceeds "
-                    f"{active_config.max_file_bytes // (1024 * 1024)}MB limit."
-                ),
+                f"{upload.filename or 'file'} exceeds {limit // BYTES_PER_MB}MB limit.",
                 413,
             )
+        buffer += chunk
+    return buffer
 
-        try:
-            if is_pdf:
-                text = extract_text_from_pdf_bytes(data, max_pages=active_config.max_pdf_pages, ocr_lang="eng")
-            else:
-                text = extract_text_from_image_bytes(data, lang="eng")
-        except Exception as exc:
-            raise ParseServiceError(
-                f"Failed to read file {upload.filename or ''}: {exc}",
-                400,
-            ) from exc
 
-        if normalized := (text or "").strip():
-            extracted_parts.append(normalized)
+async def _extract_upload_text(upload: UploadLike, kind: str, config: ParseConfig) -> str:
+    data = await _read_bounded(upload, config.max_file_bytes)
 
-    return "\n".join(extracted_parts)
-
-
-def build_parse_response(text_content: str) -> dict[str, Any]:
-    rows, unparsed = parse_text(text_content or "")
+    try:
+        if kind == "pdf":
+            extract = partial(extract_text_from_pdf_bytes, data, max_pages=config.max_pdf_pages, ocr_lang="eng")
+        else:
+            extract = partial(extract_text_from_image_bytes, data, lang="eng")
+        # PyMuPDF/Tesseract work is blocking; run it on the shared OCR worker pool
+        return await ocr_scheduler.run_blocking(extract)
+    except Exception as exc:
+        raise ParseServiceError(
+            f"Failed to read file {upload.filename or ''}: {exc}",
+            400,
+        ) from exc
+
+
+def build_parse_response(text_content: str, *, meta: dict[str, Any] | None = None) -> dict[str, Any]:
+    if not (text_content or "").strip():
+        # Nothing was extracted (e.g. blank OCR or {"text": ""}); skip the parser entirely
+        return {
+            "rows": [],
+            "unparsed_lines": [],
+            "unparsed": [],
+            "meta": dict(meta or {}),
+            "extracted_text": text_content or "",
+        }
+
+    rows, unparsed = parse_text(text_content)
     payload_rows = []
     for index, row in enumerate(rows, start=1):
         payload_rows.append(
@@ -149,6 +210,6 @@ def build_parse_response(text_content: str) -> dict[str, Any]:
         "rows": payload_rows,
         "unparsed_lines": unparsed,
         "unparsed": [{"page": None, "text": item} for item in unparsed],
-        "meta": {},
+        "meta": dict(meta or {}),
         "extracted_text": text_content or "",
     }
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-import os
 import time
 from typing import Any
 
 import httpx
+import orjson
 
 from app.db.models import FindingFlag, ReportFinding
-from app.services.llm import _call_openai_chat, _call_openai_responses, _resolve_model, _timeout_seconds
+from app.services.llm import (
+    _call_with_chat_fallback,
+    _is_cacheable_call,
+    _resolve_model,
+    _use_responses,
+)
+from app.services.llm_cache import get_questions_cache, prompt_key
 
 logger = logging.getLogger("reportrx.backend")
 
@@ -38,6 +43,19 @@ def _fallback_questions(flagged_findings: list[ReportFinding]) -> list[str]:
         "Are there immediate steps or new medications needed based on these flags?"
     ]
 
+# Fixed instructions plus the results header, built once; only the JSON results vary per call
+_PROMPT_PREFIX = (
+    "Based on the following flagged lab results, generate exactly 3 patient-friendly questions "
+    "the patient should ask their clinician. The questions should cover: "
+    "1. Symptoms or causes relative to the abnormal findings, "
+    "2. Level of concern or urgency, "
+    "3. Recommended next steps or timeline for follow-up.\n"
+    "Return the output as a valid JSON array of strings, with no additional text or Markdown formatting.\n\n"
+    "Example Output:\n"
+    '["What could be causing my elevated glucose?", "Should I be concerned about my low iron?", "When should I retest?"]\n\n'
+    "RESULTS:\n"
+)
+
 def _build_prompt(flagged_findings: list[ReportFinding]) -> str:
     simplified = [
         {
@@ -48,23 +66,12 @@ def _build_prompt(flagged_findings: list[ReportFinding]) -> str:
         }
         for f in flagged_findings
     ]
-    
-    instructions = (
-        "Based on the following flagged lab results, generate exactly 3 patient-friendly questions "
-        "the patient should ask their clinician. The questions should cover: "
-        "1. Symptoms or causes relative to the abnormal findings, "
-        "2. Level of concern or urgency, "
-        "3. Recommended next steps or timeline for follow-up.\n"
-        "Return the output as a valid JSON array of strings, with no additional text or Markdown formatting.\n\n"
-        "Example Output:\n"
-        '["What could be causing my elevated glucose?", "Should I be concerned about my low iron?", "When should I retest?"]\n\n'
-    )
-    return instructions + "RESULTS:\n" + json.dumps(simplified, ensure_ascii=False)
+    return _PROMPT_PREFIX + orjson.dumps(simplified).decode("utf-8")
 
 async def generate_questions(findings: list[ReportFinding]) -> tuple[list[str], dict[str, Any]]:
     start = time.perf_counter()
     meta: dict[str, Any] = {"llm": "none", "attempts": 0}
-    meta["model"] = _resolve_model(os.getenv("OPENAI_MODEL", "gpt-5"))
+    meta["model"] = _resolve_model()
     meta["endpoint"] = "unknown"
     
     flagged = [f for f in findings if f.flag in {FindingFlag.HIGH, FindingFlag.LOW, FindingFlag.ABNORMAL}]
@@ -78,21 +85,26 @@ async def generate_questions(findings: list[ReportFinding]) -> tuple[list[str],
     prompt = _build_prompt(flagged[:10])  # limit to 10 flags to fit context
     
     try:
-        use_responses = meta["model"].startswith("gpt-5") or os.getenv("OPENAI_USE_RESPONSES", "0") in {"1", "true", "True"}
+        use_responses = _use_responses(meta["model"])
         meta["llm"] = "openai"
-        meta["attempts"] = 1
         meta["endpoint"] = "responses" if use_responses else "chat.completions"
         
         raw: str
         call: dict[str, Any]
-        if use_responses:
-            try:
-                raw, call = await _call_openai_responses(prompt, timeout_s=_timeout_seconds("responses"))
-            except Exception:
-                meta["endpoint"] = "chat.completions"
-                raw, call = await _call_openai_chat(prompt, timeout_s=_timeout_seconds("chat"))
+        # Reports with the same flagged findings build the same prompt; serve repeats from memory
+        cache = get_questions_cache()
+        cache_key = None
+        cached = None
+        if _is_cacheable_call(meta["model"], meta["endpoint"]):
+            cache_key = prompt_key(meta["model"], meta["endpoint"], prompt)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            raw, call = cached
+            meta["cache"] = "hit"
         else:
-            raw, call = await _call_openai_chat(prompt, timeout_s=_timeout_seconds("chat"))
+            meta["cache"] = "miss"
+            meta["attempts"] = 1
+            raw, call = await _call_with_chat_fallback(prompt, meta)
             
         text_out = (raw or "").strip()
         
@@ -106,7 +118,7 @@ async def generate_questions(findings: list[ReportFinding]) -> tuple[list[str],
                 text_out = text_out[:-3]
             text_out = text_out.strip()
             
-            parsed = json.loads(text_out)
+            parsed = orjson.loads(text_out)
             if isinstance(parsed, list) and all(isinstance(i, str) for i in parsed):
                 questions = parsed
         except Exception:
@@ -115,10 +127,14 @@ async def generate_questions(findings: list[ReportFinding]) -> tuple[list[str],
         if len(questions) < 2:
             # Fallback if parsing failed or didn't provide enough
             questions = _fallback_questions(flagged)
+        elif cache_key and meta["cache"] == "miss":
+            # Only usable replies are cached; a malformed one is retried on the next request
+            cache.put(cache_key, raw, call or {})
 
         meta["ok"] = True
         if call:
-            if "usage" in call:
+            # A cache hit spent no tokens; the stored usage belongs to the original call
+            if "usage" in call and meta["cache"] == "miss":
                 meta["usage"] = call["usage"]
         logger.info({"event": "llm_generate_questions", "ok": True, "attempts": meta["attempts"]})
         
@@ -15,10 +15,40 @@ for path in (str(PROJECT_ROOT), str(BACKEND_ROOT)):
     if path not in sys.path:
         sys.path.insert(0, path)
 
+from app.config import get_settings  # noqa: E402
 from app.db.base import Base  # noqa: E402
+from app.services.llm import invalidate_llm_env  # noqa: E402
+from app.services.llm_cache import (  # noqa: E402
+    get_interpretation_cache,
+    get_questions_cache,
+    get_semantic_cache,
+    get_translation_cache,
+)
+from app.services.ocr_cache import get_ocr_cache  # noqa: E402
 from tests.factories import PersistenceFactory  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def _reset_app_settings():
+    # Settings, LLM env, OCR results and LLM output are cached per process; drop them so
+    # monkeypatched env and stubs apply.
+    get_settings.cache_clear()
+    invalidate_llm_env()
+    get_ocr_cache.cache_clear()
+    get_translation_cache.cache_clear()
+    get_interpretation_cache.cache_clear()
+    get_semantic_cache.cache_clear()
+    get_questions_cache.cache_clear()
+    yield
+    get_settings.cache_clear()
+    invalidate_llm_env()
+    get_ocr_cache.cache_clear()
+    get_translation_cache.cache_clear()
+    get_interpretation_cache.cache_clear()
+    get_semantic_cache.cache_clear()
+    get_questions_cache.cache_clear()
+
+
 @pytest.fixture()
 def db_session() -> Session:
     engine = create_engine(
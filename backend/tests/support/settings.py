@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any
+
+from app.config import AppSettings
+
+
+def build_test_settings(**overrides: Any) -> AppSettings:
+    """Build AppSettings from known-good defaults without reading the environment.
+
+    Test-only: application code must keep going through `app.config.get_settings()`.
+    """
+    return replace(AppSettings(), **overrides)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from app.main import API_V1_ROUTERS
+
+
+def test_each_api_route_is_registered_once():
+    assert len({id(router) for router in API_V1_ROUTERS}) == len(API_V1_ROUTERS)
+
+    registrations = Counter(
+        (route.path, method)
+        for router in API_V1_ROUTERS
+        for route in router.routes
+        for method in getattr(route, "methods", None) or ()
+    )
+    duplicates = [key for key, count in registrations.items() if count > 1]
+
+    assert duplicates == []
+    assert registrations[("/parse", "POST")] == 1
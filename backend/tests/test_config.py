@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import AppSettings, get_settings
+
+
+def test_get_settings_is_cached_until_cleared(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CLEANUP_INTERVAL_MINUTES", "7")
+
+    first = get_settings()
+    monkeypatch.setenv("CLEANUP_INTERVAL_MINUTES", "9")
+
+    assert get_settings() is first
+    assert first.cleanup_interval_minutes == 7
+
+    get_settings.cache_clear()
+    assert get_settings().cleanup_interval_minutes == 9
+
+
+def test_app_settings_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("ALEMBIC_STARTUP_TIMEOUT_SECONDS", raising=False)
+    monkeypatch.delenv("CLEANUP_INTERVAL_MINUTES", raising=False)
+
+    settings = AppSettings.from_env()
+
+    assert settings.alembic_startup_timeout_seconds == 60
+    assert settings.cleanup_interval_minutes == 5
+
+
+def test_cors_origins_are_split_once_and_normalized(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("FRONTEND_URL", " http://localhost:3000/ , https://reportx.example.com,, ")
+
+    settings = AppSettings.from_env()
+
+    assert settings.cors_origins == ("http://localhost:3000", "https://reportx.example.com")
+
+
+def test_allowed_hosts_always_include_testserver(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ALLOWED_HOSTS", " api.reportx.example.com , backend ")
+
+    settings = AppSettings.from_env()
+
+    assert settings.allowed_hosts == ("api.reportx.example.com", "backend", "testserver")
+
+
+def test_ocr_env_flags_are_read_into_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ENABLE_OCR", "false")
+    monkeypatch.setenv("TESSERACT_CONFIG", "--psm 6")
+
+    settings = AppSettings.from_env()
+
+    assert settings.ocr_enabled is False
+    assert settings.tesseract_config == "--psm 6"
@@ -53,7 +53,7 @@ def test_interpret_repair_on_malformed(monkeypatch):
     # Force the LLM call to return malformed then ensure fallback JSON is returned
     from app.services import llm as llm_module
 
-    async def bad_call(prompt: str, timeout_s: float) -> str:  # type: ignore
+    async def bad_call(prompt: str, timeout_s: float, model: str | None = None) -> str:  # type: ignore
         return "not-json"
 
     monkeypatch.setenv("OPENAI_API_KEY", "dummy")
@@ -76,7 +76,7 @@ def test_interpret_rows_prefers_llm_summary(monkeypatch):
     assert base.per_test  # sanity check fallback provides per-test context
     assert base.next_steps
 
-    async def good_call(prompt: str, timeout_s: float) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+    async def good_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
         return "Stub summary from LLM", {"usage": {"total_tokens": 42}}
 
     monkeypatch.setenv("OPENAI_API_KEY", "dummy")
@@ -93,3 +93,389 @@ def test_interpret_rows_prefers_llm_summary(monkeypatch):
     assert result.disclaimer == base.disclaimer
     assert result.translations == {}
     assert meta.get("translation_meta", {}).get("skipped") == "lazy_on_demand"
+
+def test_interpret_rejects_missing_or_empty_rows():
+    client = TestClient(app)
+    assert client.post("/api/v1/interpret", json={"rows": []}).status_code == 400
+    assert client.post("/api/v1/interpret", json={}).status_code == 400
+    assert client.post("/api/v1/interpret", json={"rows": [{"value": 1}]}).status_code == 422
+
+
+def test_interpret_rows_serves_identical_prompts_from_cache(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls: list[str] = []
+
+    async def good_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        calls.append(prompt)
+        return "Stub summary from LLM", {"usage": {"total_tokens": 42}}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-5")
+    monkeypatch.setattr(llm_module, "_call_openai_responses", good_call)
+
+    built: list[int] = []
+    build_user_prompt = llm_module._build_user_prompt
+    monkeypatch.setattr(
+        llm_module, "_build_user_prompt", lambda rows: built.append(len(rows)) or build_user_prompt(rows)
+    )
+
+    rows = [llm_module.ParsedRowIn.model_validate(r) for r in sample_rows()]
+    first, first_meta = asyncio.run(llm_module.interpret_rows(rows))
+    second, second_meta = asyncio.run(llm_module.interpret_rows(rows))
+
+    assert len(calls) == 1
+    # The cache is probed from the rows, so a hit never serializes the prompt
+    assert len(built) == 1
+    assert first_meta["cache"] == "miss"
+    assert second_meta["cache"] == "hit"
+    assert first_meta["usage"] == {"total_tokens": 42}
+    assert "usage" not in second_meta
+    assert second.summary == first.summary == "Stub summary from LLM"
+
+
+def test_interpret_rows_skips_cache_for_sampled_chat_models(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls: list[str] = []
+
+    async def good_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        calls.append(prompt)
+        return "Stub summary from LLM", {}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o-mini")
+    monkeypatch.setenv("OPENAI_TEMPERATURE", "0.6")
+    monkeypatch.delenv("OPENAI_USE_RESPONSES", raising=False)
+    monkeypatch.setattr(llm_module, "_call_openai_chat", good_call)
+
+    rows = [llm_module.ParsedRowIn.model_validate(r) for r in sample_rows()]
+    asyncio.run(llm_module.interpret_rows(rows))
+    asyncio.run(llm_module.interpret_rows(rows))
+
+    assert len(calls) == 2
+
+
+def test_interpret_rows_reuses_summary_for_reordered_rows(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls: list[str] = []
+
+    async def good_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        calls.append(prompt)
+        return "Stub summary from LLM", {}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-5")
+    monkeypatch.setattr(llm_module, "_call_openai_responses", good_call)
+
+    rows = [llm_module.ParsedRowIn.model_validate(r) for r in sample_rows()]
+    reordered = [rows[1].model_copy(update={"test_name": "  ldl   cholesterol "}), rows[0]]
+    asyncio.run(llm_module.interpret_rows(rows))
+    result, meta = asyncio.run(llm_module.interpret_rows(reordered))
+
+    assert len(calls) == 1
+    assert meta["cache"] == "semantic_hit"
+    assert result.summary == "Stub summary from LLM"
+
+
+def test_interpret_rows_keeps_small_distinct_values_apart(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls: list[str] = []
+
+    async def good_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        calls.append(prompt)
+        return "Stub summary from LLM", {}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-5")
+    monkeypatch.setattr(llm_module, "_call_openai_responses", good_call)
+
+    troponin = {"test_name": "hs-Troponin I", "value": 0.0004, "unit": "ng/mL", "flag": "high", "confidence": 0.9}
+    rows = [llm_module.ParsedRowIn.model_validate(troponin)]
+    lower = [llm_module.ParsedRowIn.model_validate({**troponin, "value": 0.0001})]
+    asyncio.run(llm_module.interpret_rows(rows))
+    _, meta = asyncio.run(llm_module.interpret_rows(lower))
+
+    assert len(calls) == 2
+    assert meta["cache"] == "miss"
+
+
+def test_build_user_prompt_serializes_rows_as_utf8_json():
+    import json
+
+    from app.services import llm as llm_module
+
+    rows = [llm_module.ParsedRowIn.model_validate(r) for r in sample_rows()]
+    prompt = llm_module._build_user_prompt(rows)
+
+    _, rows_json = prompt.split("\n\nROWS:\n")
+    assert "≤ 200" in rows_json
+    assert json.loads(rows_json)[1] == {
+        "test_name": "LDL Cholesterol",
+        "value": 210.0,
+        "unit": "mg/dL",
+        "reference_range": "≤ 200",
+        "flag": "high",
+    }
+
+
+def test_fallback_interpretation_groups_flagged_rows_by_severity():
+    from app.services import llm as llm_module
+
+    rows = [
+        llm_module.ParsedRowIn(test_name="Sodium", value=140, unit="mmol/L", flag="normal", confidence=0.9),
+        llm_module.ParsedRowIn(test_name="Iron", value=5, unit="umol/L", flag="low", confidence=0.9),
+        llm_module.ParsedRowIn(test_name="HIV", value="Reactive", flag="abnormal", confidence=0.9),
+        llm_module.ParsedRowIn(test_name="ALT", value=61, unit="U/L", reference_range="0-55", flag="high", confidence=0.9),
+    ]
+
+    result = llm_module._fallback_interpretation(rows)
+
+    assert result.summary.splitlines() == ["ALT 61.0 U/L [0-55] HIGH", "HIV Reactive ABNORMAL", "Iron 5.0 umol/L LOW"]
+    assert [(f.test_name, f.severity) for f in result.flags] == [("ALT", "high"), ("HIV", "abnormal"), ("Iron", "low")]
+    assert [p.test_name for p in result.per_test] == ["ALT", "HIV", "Iron"]
+    assert result.next_steps[1] == "Review flagged results together: ALT, Iron, HIV."
+    assert any("low Iron" in step for step in result.next_steps)
+    # Built with model_construct, but must still be a valid InterpretationOut
+    dumped = result.model_dump()
+    assert llm_module.InterpretationOut.model_validate(dumped).model_dump() == dumped
+
+
+def test_flag_buckets_order_by_severity_then_name():
+    from app.services import llm as llm_module
+
+    def row(name: str, flag: str):
+        return llm_module.ParsedRowIn(test_name=name, value=1, flag=flag, confidence=0.9)
+
+    rows = [row("zinc", "low"), row("Sodium", "normal"), row("b12", "high"), row("Albumin", "low"), row("ALT", "high")]
+
+    flagged = llm_module._flagged_rows(llm_module._flag_buckets(rows))
+
+    assert [r.test_name for r in flagged] == ["ALT", "b12", "Albumin", "zinc"]
+
+
+def test_llm_env_is_memoized_until_invalidated(monkeypatch):
+    from app.services import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_MAX_OUTPUT_TOKENS", "800")
+    assert llm_module._max_tokens() == 800
+
+    monkeypatch.setenv("OPENAI_MAX_OUTPUT_TOKENS", "900")
+    assert llm_module._max_tokens() == 800
+
+    llm_module.invalidate_llm_env()
+    assert llm_module._max_tokens() == 900
+
+
+def test_call_gpt5_chat_awaits_async_client_on_event_loop(monkeypatch):
+    import threading
+    from types import SimpleNamespace
+
+    from app.services import llm as llm_module
+
+    captured: dict[str, Any] = {}
+
+    class FakeCompletions:
+        async def create(self, **kwargs):
+            captured["kwargs"] = kwargs
+            captured["thread"] = threading.current_thread()
+            message = SimpleNamespace(content="Async summary")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage={"total_tokens": 7})
+
+    class FakeClient:
+        chat = SimpleNamespace(completions=FakeCompletions())
+
+    monkeypatch.setattr(llm_module, "_get_async_openai_client", lambda: FakeClient())
+
+    text, call = asyncio.run(llm_module.call_gpt5_chat("prompt", "gpt-4o-mini", timeout_s=9.0))
+
+    assert text == "Async summary"
+    assert call["usage"] == {"total_tokens": 7}
+    assert captured["kwargs"]["timeout"] == 9.0
+    assert captured["kwargs"]["messages"][0] is llm_module._SYS_MSG
+    assert captured["thread"] is threading.main_thread()
+
+
+def test_async_openai_client_is_reused_within_an_event_loop(monkeypatch):
+    from app.services import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+
+    async def run():
+        first = llm_module._get_async_openai_client()
+        second = llm_module._get_async_openai_client()
+        await llm_module.aclose_openai_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first.is_closed()
+
+
+def test_stale_async_openai_client_is_closed_after_env_change(monkeypatch):
+    from app.services import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+
+    async def run():
+        stale = llm_module._get_async_openai_client()
+        monkeypatch.setenv("OPENAI_API_KEY", "rotated")
+        llm_module.invalidate_llm_env()
+        fresh = llm_module._get_async_openai_client()
+        tracked = len(llm_module._closing_tasks)
+        await asyncio.sleep(0)
+        await asyncio.gather(*llm_module._closing_tasks)
+        await llm_module.aclose_openai_client()
+        return stale, fresh, tracked
+
+    stale, fresh, tracked = asyncio.run(run())
+
+    assert stale is not fresh
+    assert tracked == 1
+    assert stale.is_closed()
+    assert not llm_module._closing_tasks
+
+
+def test_fallback_interpretation_all_normal_rows():
+    from app.services import llm as llm_module
+
+    rows = [llm_module.ParsedRowIn(test_name="Sodium", value=140, flag="normal", confidence=0.9)]
+
+    first = llm_module._fallback_interpretation(rows)
+    second = llm_module._fallback_interpretation(rows)
+
+    assert first.summary == "All provided values are within reference ranges."
+    assert first.per_test == [] and first.flags == []
+    assert len(first.next_steps) == 6
+    assert first.next_steps[0].startswith("Please schedule a visit with your doctor")
+    assert first.next_steps is not second.next_steps
+
+
+def test_responses_text_mines_nested_dump_in_document_order():
+    from app.services import llm as llm_module
+
+    class DumpOnly:
+        def model_dump(self):
+            return {
+                "output_text": "",
+                "output": [
+                    {"content": [{"text": "Hello"}, {"nested": {"text": ", "}}]},
+                    {"text": "world"},
+                ],
+            }
+
+    assert llm_module._responses_text_from_resp(DumpOnly()) == "Hello, world"
+
+
+def test_jsonable_usage_stringifies_opaque_objects():
+    from app.services import llm as llm_module
+
+    class OpaqueUsage:
+        def __str__(self) -> str:
+            return "opaque-usage"
+
+    assert llm_module._jsonable_usage({"total_tokens": 3}) == {"total_tokens": 3}
+    assert llm_module._jsonable_usage(OpaqueUsage()) == "opaque-usage"
+
+
+def test_jsonable_usage_caches_serializer_per_type():
+    from pydantic import BaseModel
+
+    from app.services import llm as llm_module
+
+    class Usage(BaseModel):
+        prompt_tokens: int
+        completion_tokens: int
+
+    assert llm_module._jsonable_usage(Usage(prompt_tokens=1, completion_tokens=2)) == {
+        "prompt_tokens": 1,
+        "completion_tokens": 2,
+    }
+    assert llm_module._USAGE_SERIALIZERS[Usage] is Usage.model_dump
+    assert llm_module._jsonable_usage(Usage(prompt_tokens=5, completion_tokens=6)) == {
+        "prompt_tokens": 5,
+        "completion_tokens": 6,
+    }
+
+
+def test_slow_responses_call_is_hedged_with_chat(monkeypatch):
+    from app.services import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_HEDGE_AFTER_S", "0.01")
+    cancelled: list[bool] = []
+
+    async def slow_responses(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "late", {}
+
+    async def fast_chat(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        return "from chat", {"endpoint": "chat.completions"}
+
+    monkeypatch.setattr(llm_module, "_call_openai_responses", slow_responses)
+    monkeypatch.setattr(llm_module, "_call_openai_chat", fast_chat)
+
+    meta: dict[str, Any] = {"endpoint": "responses", "model": "gpt-5"}
+    raw, _ = asyncio.run(llm_module._call_with_chat_fallback("prompt", meta))
+
+    assert raw == "from chat"
+    assert meta["endpoint"] == "chat.completions"
+    assert meta["hedged"] is True
+    assert cancelled == [True]
+
+
+def test_hedge_wait_cancels_primary_when_caller_is_cancelled(monkeypatch):
+    from app.services import llm as llm_module
+
+    monkeypatch.setenv("OPENAI_HEDGE_AFTER_S", "5")
+    cancelled: list[bool] = []
+
+    async def slow_responses(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "late", {}
+
+    monkeypatch.setattr(llm_module, "_call_openai_responses", slow_responses)
+
+    async def run() -> None:
+        meta = {"endpoint": "responses", "model": "gpt-5"}
+        caller = asyncio.ensure_future(llm_module._call_with_chat_fallback("prompt", meta))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        try:
+            await caller
+        except asyncio.CancelledError:
+            pass
+        # Let the cancelled primary unwind; asserting here, before asyncio.run() tears down leftover
+        # tasks, shows the caller's cancellation reached it
+        await asyncio.sleep(0)
+        assert cancelled == [True]
+
+    asyncio.run(run())
+
+
+def test_hedge_race_treats_cancelled_primary_as_failure(monkeypatch):
+    from app.services import llm as llm_module
+
+    async def run() -> tuple[str, dict[str, Any]]:
+        async def chat(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+            await asyncio.sleep(0.01)
+            return "from chat", {}
+
+        monkeypatch.setattr(llm_module, "_call_openai_chat", chat)
+        primary = asyncio.ensure_future(asyncio.sleep(10))
+        primary.cancel()
+        return await llm_module._race_with_chat(primary, "prompt", {"endpoint": "responses", "model": "gpt-5"})  # type: ignore[arg-type]
+
+    raw, _ = asyncio.run(run())
+
+    assert raw == "from chat"
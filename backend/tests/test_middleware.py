@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import Response
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def _request_log_records(caplog: pytest.LogCaptureFixture) -> list[dict]:
+    return [
+        dict(zip(("method", "path", "status", "duration_ms", "request_id"), record.args))
+        for record in caplog.records
+        if isinstance(record.msg, str) and record.msg.startswith("http_request ")
+    ]
+
+
+def test_request_id_is_echoed_and_logged(caplog: pytest.LogCaptureFixture) -> None:
+    client = TestClient(create_app())
+
+    with caplog.at_level(logging.INFO, logger="reportrx.backend"):
+        response = client.get("/api/v1/health", headers={"X-Request-ID": "abc123"})
+
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "abc123"
+    [record] = _request_log_records(caplog)
+    assert record["request_id"] == "abc123"
+    assert record["status"] == 200
+    assert record["path"] == "/api/v1/health"
+    assert any("request_id=abc123" in r.getMessage() for r in caplog.records)
+
+
+def test_generated_request_id_matches_logged_id(caplog: pytest.LogCaptureFixture) -> None:
+    client = TestClient(create_app())
+
+    with caplog.at_level(logging.INFO, logger="reportrx.backend"):
+        response = client.get("/api/v1/health")
+
+    generated = response.headers["x-request-id"]
+    assert len(generated) == 32
+    [record] = _request_log_records(caplog)
+    assert record["request_id"] == generated
+
+
+def test_security_headers_are_added_to_responses() -> None:
+    client = TestClient(create_app())
+
+    response = client.get("/api/v1/health")
+
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["referrer-policy"] == "no-referrer"
+    assert response.headers["permissions-policy"] == "interest-cohort=()"
+
+
+def test_security_headers_do_not_override_route_headers() -> None:
+    app = create_app()
+
+    @app.get("/framed")
+    async def framed() -> Response:
+        return Response(headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    response = TestClient(app).get("/framed")
+
+    assert response.headers.get_list("x-frame-options") == ["SAMEORIGIN"]
+    assert response.headers["x-content-type-options"] == "nosniff"
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from app.services import ocr_cache
+from app.services.ocr_cache import OcrCache, cache_key
+
+
+def test_ocr_cache_evicts_least_recently_used() -> None:
+    cache = OcrCache(maxsize=2, ttl_seconds=60)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # refresh "a" so "b" is evicted next
+
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_ocr_cache_disabled_when_size_zero() -> None:
+    cache = OcrCache(maxsize=0, ttl_seconds=60)
+    cache.put("a", "A")
+    assert cache.get("a") is None
+
+
+def test_ocr_cache_entries_expire_after_ttl(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(ocr_cache.time, "monotonic", lambda: now[0])
+    cache = OcrCache(maxsize=2, ttl_seconds=60)
+    cache.put("a", "A")
+
+    now[0] = 159.0
+    assert cache.get("a") == "A"
+    now[0] = 160.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_key_depends_on_content_and_options() -> None:
+    assert cache_key(b"pdf", "pdf", "eng", 5) == cache_key(b"pdf", "pdf", "eng", 5)
+    assert cache_key(b"pdf", "pdf", "eng", 5) != cache_key(b"pdf", "pdf", "eng", 10)
+    assert cache_key(b"pdf", "pdf", "eng", 5) != cache_key(b"other", "pdf", "eng", 5)
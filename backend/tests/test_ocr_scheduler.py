@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.services import ocr_scheduler
+
+
+def test_run_blocking_uses_shared_worker_pool() -> None:
+    async def run() -> str:
+        return await ocr_scheduler.run_blocking(lambda: threading.current_thread().name)
+
+    try:
+        assert asyncio.run(run()).startswith("ocr-worker")
+    finally:
+        ocr_scheduler.shutdown()
+
+
+def test_shutdown_allows_pool_to_be_recreated() -> None:
+    first = ocr_scheduler.get_executor()
+    ocr_scheduler.shutdown()
+
+    second = ocr_scheduler.get_executor()
+    try:
+        assert second is not first
+        assert second.submit(lambda: 42).result(timeout=5) == 42
+    finally:
+        ocr_scheduler.shutdown()
@@ -48,3 +48,33 @@ def test_parse_multiple_uploads_preserves_extracted_text_order(monkeypatch):
     payload = response.json()
     assert payload["extracted_text"] == "Glucose 92 mg/dL 70-99\nALT 61 U/L 0-55"
     assert [row["test_name"] for row in payload["rows"]] == ["Glucose", "ALT"]
+
+
+def test_parse_json_body_reports_date_and_display_name():
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/parse",
+        json={"text": "Collected: 2024-03-05\nGlucose 92 mg/dL 70-99"},
+    )
+
+    assert response.status_code == 200, response.text
+    payload = response.json()
+    assert payload["meta"]["report_date"].startswith("2024-03-05")
+    assert payload["rows"][0]["display_name"] == "Glucose"
+
+
+def test_parse_json_body_requires_json_content_type_and_text_field():
+    client = TestClient(app)
+
+    wrong_type = client.post(
+        "/api/v1/parse",
+        content=b'{"text": "Glucose 92 mg/dL 70-99"}',
+        headers={"content-type": "text/plain"},
+    )
+    missing_text = client.post("/api/v1/parse", json={"rows": []})
+
+    assert wrong_type.status_code == 400
+    assert wrong_type.json()["detail"].startswith("Send a PDF file or JSON")
+    assert missing_text.status_code == 400
+    assert missing_text.json()["detail"] == "Body must include 'text'."
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import threading
+import time
 from dataclasses import dataclass
 
 import pytest
@@ -19,9 +21,13 @@ class FakeUpload:
     filename: str
     content_type: str
     data: bytes
+    offset: int = 0
 
-    async def read(self) -> bytes:
-        return self.data
+    async def read(self, size: int = -1) -> bytes:
+        end = len(self.data) if size < 0 else self.offset + size
+        chunk = self.data[self.offset:end]
+        self.offset += len(chunk)
+        return chunk
 
 
 def test_extract_text_from_uploads_rejects_too_many_files():
@@ -56,3 +62,120 @@ def test_build_parse_response_preserves_row_order_and_contract_keys():
     assert response["rows"][1]["id"] == "r2"
     assert response["meta"] == {}
     assert response["extracted_text"].startswith("Glucose 92")
+
+
+def test_extract_text_from_uploads_runs_files_concurrently_in_upload_order(monkeypatch):
+    from app.services import parse_pipeline
+
+    both_started = threading.Barrier(2, timeout=5)
+
+    def fake_pdf(data: bytes, max_pages: int = 10, ocr_lang: str | None = None) -> str:
+        both_started.wait()  # only passes if the two files are extracted at the same time
+        time.sleep(0.05)
+        return "Glucose 92 mg/dL 70-99"
+
+    def fake_image(data: bytes, lang: str | None = None) -> str:
+        both_started.wait()
+        return "ALT 61 U/L 0-55"
+
+    monkeypatch.setattr(parse_pipeline, "extract_text_from_pdf_bytes", fake_pdf)
+    monkeypatch.setattr(parse_pipeline, "extract_text_from_image_bytes", fake_image)
+
+    uploads = [
+        FakeUpload(filename="report.pdf", content_type="application/pdf", data=b"%PDF"),
+        FakeUpload(filename="scan.png", content_type="image/png", data=b"png"),
+    ]
+
+    text = asyncio.run(extract_text_from_uploads(uploads, content_length=None))
+
+    assert text == "Glucose 92 mg/dL 70-99\nALT 61 U/L 0-55"
+
+
+def test_extract_text_from_uploads_stops_reading_oversized_file(monkeypatch):
+    from app.services import parse_pipeline
+
+    monkeypatch.setattr(parse_pipeline, "READ_CHUNK_BYTES", 4)
+    upload = FakeUpload(filename="big.pdf", content_type="application/pdf", data=b"x" * 64)
+
+    with pytest.raises(ParseServiceError) as exc_info:
+        asyncio.run(
+            extract_text_from_uploads(
+                [upload],
+                content_length=None,
+                config=ParseConfig(max_file_bytes=10),
+            )
+        )
+
+    assert exc_info.value.status_code == 413
+    assert upload.offset == 12  # aborted on the chunk that crossed the limit
+
+
+def test_upload_kind_checks_content_type_then_extension():
+    from app.services import parse_pipeline
+
+    assert parse_pipeline._upload_kind(FakeUpload("a.bin", "application/pdf; charset=binary", b"")) == "pdf"
+    assert parse_pipeline._upload_kind(FakeUpload("scan", "image/jpeg", b"")) == "image"
+    assert parse_pipeline._upload_kind(FakeUpload("report.PDF", "application/octet-stream", b"")) == "pdf"
+    assert parse_pipeline._upload_kind(FakeUpload("photo.JPG", None, b"")) == "image"
+    assert parse_pipeline._upload_kind(FakeUpload("notes.txt", "text/plain", b"")) is None
+
+
+def test_build_parse_response_skips_parser_for_blank_text(monkeypatch):
+    from app.services import parse_pipeline
+
+    def fail_parse(_text):
+        raise AssertionError("blank text should not reach the parser")
+
+    monkeypatch.setattr(parse_pipeline, "parse_text", fail_parse)
+
+    response = build_parse_response("  \n ", meta={"report_date": None})
+
+    assert response == {
+        "rows": [],
+        "unparsed_lines": [],
+        "unparsed": [],
+        "meta": {"report_date": None},
+        "extracted_text": "  \n ",
+    }
+
+
+def test_extract_text_from_json_payload_matches_content_type_case_insensitively():
+    assert extract_text_from_json_payload("Application/JSON; charset=utf-8", {"text": "ALT 61"}) == "ALT 61"
+    assert extract_text_from_json_payload(" application/json", {"text": "ALT 61"}) == "ALT 61"
+    with pytest.raises(ParseServiceError):
+        extract_text_from_json_payload("text/plain", {"text": "ALT 61"})
+    with pytest.raises(ParseServiceError):
+        extract_text_from_json_payload("text/plain; x=application/json", {"text": "ALT 61"})
+
+
+def test_extract_text_from_uploads_cancels_other_uploads_on_failure():
+    cancelled = asyncio.Event()
+
+    @dataclass
+    class SlowUpload:
+        filename: str = "slow.pdf"
+        content_type: str = "application/pdf"
+
+        async def read(self, size: int = -1) -> bytes:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return b""
+
+    uploads = [
+        FakeUpload(filename="big.pdf", content_type="application/pdf", data=b"x" * 64),
+        SlowUpload(),
+    ]
+
+    async def run() -> ParseServiceError:
+        with pytest.raises(ParseServiceError) as exc_info:
+            await extract_text_from_uploads(uploads, content_length=None, config=ParseConfig(max_file_bytes=16))
+        # The slow upload was cancelled before extract_text_from_uploads returned
+        assert cancelled.is_set()
+        return exc_info.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 413
@@ -30,3 +30,126 @@ def test_parse_pdf_smoke():
     ldl = next((r for r in data["rows"] if r["test_name"].lower().startswith("ldl")), None)
     assert ldl is not None
     assert ldl["flag"] == "high"
+
+
+def test_pdf_text_layer_skips_ocr_unless_page_looks_scanned(monkeypatch):
+    from app.services import ocr
+
+    ocr_calls: list[int] = []
+
+    def fake_ocr_image(page_number, lang=None):
+        ocr_calls.append(page_number)
+        return "Glucose 92 mg/dL 70-99"
+
+    monkeypatch.setattr(ocr, "_ocr_enabled", lambda: True)
+    monkeypatch.setattr(ocr, "_ocr_available", lambda: True)
+    monkeypatch.setattr(ocr, "_render_pdf_page", lambda page: page.number)
+    monkeypatch.setattr(ocr, "_do_ocr_image", fake_ocr_image)
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Hemoglobin 13.2 g/dL 12.0-15.5 normal range reported")
+    doc.new_page().insert_text((72, 72), "Page 2")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    text = ocr.extract_text_from_pdf_bytes(pdf_bytes, max_pages=5)
+
+    assert ocr_calls == [1]
+    assert text == "Hemoglobin 13.2 g/dL 12.0-15.5 normal range reported\nGlucose 92 mg/dL 70-99"
+
+
+def test_pdf_extraction_is_cached_by_content(monkeypatch):
+    from app.services import ocr
+
+    pdf_bytes = make_pdf_bytes("Hemoglobin 13.2 g/dL 12.0-15.5 normal range reported")
+    first = ocr.extract_text_from_pdf_bytes(pdf_bytes, max_pages=5)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("cached PDF should not be reopened")
+
+    monkeypatch.setattr(ocr.fitz, "open", fail_open)
+
+    assert ocr.extract_text_from_pdf_bytes(pdf_bytes, max_pages=5) == first
+    assert first.startswith("Hemoglobin 13.2")
+
+
+def test_pdf_with_failed_page_ocr_is_not_cached(monkeypatch):
+    from app.services import ocr
+
+    ocr_calls: list[int] = []
+
+    def flaky_ocr_image(page_number, lang=None):
+        ocr_calls.append(page_number)
+        if len(ocr_calls) == 1:
+            raise RuntimeError("tesseract crashed")
+        return "Glucose 92 mg/dL 70-99"
+
+    monkeypatch.setattr(ocr, "_ocr_enabled", lambda: True)
+    monkeypatch.setattr(ocr, "_ocr_available", lambda: True)
+    monkeypatch.setattr(ocr, "_render_pdf_page", lambda page: page.number)
+    monkeypatch.setattr(ocr, "_do_ocr_image", flaky_ocr_image)
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Page 1")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    assert ocr.extract_text_from_pdf_bytes(pdf_bytes, max_pages=5) == "Page 1"
+    assert ocr.extract_text_from_pdf_bytes(pdf_bytes, max_pages=5) == "Glucose 92 mg/dL 70-99"
+    assert ocr_calls == [0, 0]
+
+
+def test_scanned_pdf_pages_are_ocrd_in_parallel_in_page_order(monkeypatch):
+    import threading
+
+    from app.services import ocr, ocr_scheduler
+
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fake_ocr_image(page_number, lang=None):
+        # Every page must be in flight at once for the barrier to release
+        barrier.wait()
+        return f"Result {page_number} 1.0 mg/dL"
+
+    monkeypatch.setenv("OCR_PAGE_CONCURRENCY", "3")
+    monkeypatch.setattr(ocr, "_ocr_enabled", lambda: True)
+    monkeypatch.setattr(ocr, "_ocr_available", lambda: True)
+    monkeypatch.setattr(ocr, "_render_pdf_page", lambda page: page.number)
+    monkeypatch.setattr(ocr, "_do_ocr_image", fake_ocr_image)
+
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    try:
+        text = ocr.extract_text_from_pdf_bytes(pdf_bytes, max_pages=5)
+    finally:
+        ocr_scheduler.shutdown()
+
+    assert text.splitlines() == ["Result 0 1.0 mg/dL", "Result 1 1.0 mg/dL", "Result 2 1.0 mg/dL"]
+
+
+def test_pdf_extraction_drains_mupdf_warning_buffer():
+    from app.services import ocr
+
+    broken = make_pdf_bytes("Hemoglobin 13.2 g/dL 12.0-15.5").replace(b"startxref", b"startxrex")
+
+    ocr.extract_text_from_pdf_bytes(broken, max_pages=5)
+
+    assert fitz.TOOLS.mupdf_warnings() == ""
+
+
+def test_pdf_pages_render_to_grayscale_for_ocr():
+    from app.services import ocr
+
+    doc = fitz.open(stream=make_pdf_bytes("Hemoglobin 13.2 g/dL"), filetype="pdf")
+    try:
+        img = ocr._render_pdf_page(doc[0])
+    finally:
+        doc.close()
+
+    # A4 (fitz default page) at 200 dpi, one byte per pixel
+    assert img.mode == "L"
+    assert img.size == (1653, 2339)
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Any
+
+from app.db.models import FindingFlag, ReportFinding
+
+
+def test_generate_questions_serves_repeat_prompts_from_cache(monkeypatch):
+    from app.services import llm as llm_module
+    from app.services import questions
+
+    calls: list[str] = []
+
+    async def good_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        calls.append(prompt)
+        return '["Why is my ALT high?", "Is it urgent?", "When should I retest?"]', {"usage": {"total_tokens": 9}}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-5")
+    monkeypatch.setattr(llm_module, "_call_openai_responses", good_call)
+
+    findings = [ReportFinding(display_name="ALT", value_text="61", unit="U/L", flag=FindingFlag.HIGH)]
+    first, first_meta = asyncio.run(questions.generate_questions(findings))
+    second, second_meta = asyncio.run(questions.generate_questions(findings))
+
+    assert len(calls) == 1
+    assert first == second == ["Why is my ALT high?", "Is it urgent?", "When should I retest?"]
+    assert first_meta["cache"] == "miss"
+    assert second_meta["cache"] == "hit"
+    assert second_meta["attempts"] == 0
+    assert first_meta["usage"] == {"total_tokens": 9}
+    assert "usage" not in second_meta
+
+
+def test_generate_questions_does_not_cache_unusable_replies(monkeypatch):
+    from app.services import llm as llm_module
+    from app.services import questions
+
+    calls: list[str] = []
+
+    async def bad_call(prompt: str, timeout_s: float, model: str | None = None) -> tuple[str, dict[str, Any]]:  # type: ignore[override]
+        calls.append(prompt)
+        return "Sorry, I can't help with that.", {}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "dummy")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-5")
+    monkeypatch.setattr(llm_module, "_call_openai_responses", bad_call)
+
+    findings = [ReportFinding(display_name="ALT", value_text="61", unit="U/L", flag=FindingFlag.HIGH)]
+    _, first_meta = asyncio.run(questions.generate_questions(findings))
+    _, second_meta = asyncio.run(questions.generate_questions(findings))
+
+    assert len(calls) == 2
+    assert first_meta["cache"] == second_meta["cache"] == "miss"
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock
 import pytest
 
 from app import main as main_mod
+from tests.support.settings import build_test_settings
 
 
 @pytest.mark.asyncio
@@ -72,3 +73,80 @@ async def test_app_lifespan_defaults_cleanup_interval_to_five_minutes(
     assert captured["started"] is True
     assert captured["shutdown"] is True
     assert captured["disposed"] is True
+
+
+@pytest.mark.asyncio
+async def test_app_lifespan_reads_injected_settings(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    captured: dict[str, object] = {}
+
+    class FakeScheduler:
+        def add_job(self, _func, _trigger, *, minutes: int, **_kwargs):
+            captured["minutes"] = minutes
+
+        def start(self):
+            pass
+
+        def shutdown(self):
+            pass
+
+    class FakeDatabase:
+        async def dispose(self):
+            pass
+
+    async def fake_run_alembic_migrations(_project_root: str, timeout: int):
+        captured["timeout"] = timeout
+
+    settings = build_test_settings(cleanup_interval_minutes=15, alembic_startup_timeout_seconds=7)
+    monkeypatch.setattr(main_mod, "get_settings", lambda: settings)
+    monkeypatch.setattr(main_mod, "AsyncIOScheduler", lambda: FakeScheduler())
+    monkeypatch.setattr(main_mod, "_run_alembic_migrations", fake_run_alembic_migrations)
+    monkeypatch.setattr(main_mod.ocr, "_ocr_available", lambda: False)
+
+    fake_app = SimpleNamespace(state=SimpleNamespace(database=FakeDatabase()))
+    with caplog.at_level("WARNING"):
+        async with main_mod.app_lifespan(fake_app):
+            pass
+
+    assert "OCR backend unavailable" in caplog.text
+
+    assert captured == {"timeout": 7, "minutes": 15}
+
+
+@pytest.mark.asyncio
+async def test_app_lifespan_skips_ocr_probe_when_disabled(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    class FakeScheduler:
+        def add_job(self, *_args, **_kwargs):
+            pass
+
+        def start(self):
+            pass
+
+        def shutdown(self):
+            pass
+
+    class FakeDatabase:
+        async def dispose(self):
+            pass
+
+    async def fake_run_alembic_migrations(_project_root: str, timeout: int):
+        pass
+
+    def probe() -> bool:
+        raise AssertionError("OCR probe should not run when OCR is disabled")
+
+    settings = build_test_settings(ocr_enabled=False)
+    monkeypatch.setattr(main_mod, "get_settings", lambda: settings)
+    monkeypatch.setattr(main_mod, "AsyncIOScheduler", lambda: FakeScheduler())
+    monkeypatch.setattr(main_mod, "_run_alembic_migrations", fake_run_alembic_migrations)
+    monkeypatch.setattr(main_mod.ocr, "_ocr_available", probe)
+
+    fake_app = SimpleNamespace(state=SimpleNamespace(database=FakeDatabase()))
+    with caplog.at_level("WARNING"):
+        async with main_mod.app_lifespan(fake_app):
+            pass
+
+    assert "OCR backend unavailable" not in caplog.text
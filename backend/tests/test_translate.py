@@ -54,3 +54,110 @@ def test_translate_blank_text():
     resp = client.post("/api/v1/translate", json={"text": "  \n\t  ", "target_language": "es"})
     assert resp.status_code == 400
 
+
+def test_translate_upstream_failure_returns_bad_gateway(monkeypatch):
+    from app.services import llm as llm_module
+
+    async def stub_translate_fail(text: str, *, target_language: str, language_label: str):  # type: ignore
+        return None, {
+            "ok": False,
+            "error": {"code": "RateLimitError", "message": "slow down"},
+            "language": target_language,
+            "internal": "not exposed",
+        }
+
+    monkeypatch.setattr(llm_module, "translate_summary", stub_translate_fail)
+    monkeypatch.setenv("TRANSLATE_RETRY_BACKOFF_SECONDS", "0")
+
+    client = TestClient(app)
+    resp = client.post(
+        "/api/v1/translate",
+        json={"text": "Hello world", "target_language": "fr", "prefetch_all": True},
+    )
+    assert resp.status_code == 502
+    body = resp.json()
+    assert body.get("detail") == "Translation failed"
+    assert body.get("meta", {}).get("language") == "fr"
+    assert "internal" not in body.get("meta", {})
+
+
+def test_translate_retries_transient_failures(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls = []
+
+    async def stub_translate_flaky(text: str, *, target_language: str, language_label: str):  # type: ignore
+        calls.append(target_language)
+        if len(calls) < 3:
+            return None, {"ok": False, "error": {"status": 429, "code": "rate_limit_exceeded"}}
+        return "Bonjour", {"ok": True, "language": target_language}
+
+    monkeypatch.setattr(llm_module, "translate_summary", stub_translate_flaky)
+    monkeypatch.setenv("TRANSLATE_RETRY_BACKOFF_SECONDS", "0")
+
+    client = TestClient(app)
+    resp = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "fr"})
+    assert resp.status_code == 200
+    assert resp.json()["meta"]["attempts"] == 3
+    assert calls == ["fr", "fr", "fr"]
+
+
+def test_translate_does_not_retry_missing_api_key(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls = []
+
+    async def stub_translate_fail(text: str, *, target_language: str, language_label: str):  # type: ignore
+        calls.append(target_language)
+        return None, {"ok": False, "error": {"code": "missing_api_key"}, "language": target_language}
+
+    monkeypatch.setattr(llm_module, "translate_summary", stub_translate_fail)
+
+    client = TestClient(app)
+    resp = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "es"})
+    assert resp.status_code == 503
+    assert resp.json()["meta"]["attempts"] == 1
+    assert calls == ["es"]
+
+
+def test_translate_serves_repeat_requests_from_cache(monkeypatch):
+    from app.services import llm as llm_module
+
+    calls = []
+
+    async def stub_translate(text: str, *, target_language: str, language_label: str):  # type: ignore
+        calls.append(target_language)
+        return "Hola", {"ok": True, "language": target_language}
+
+    monkeypatch.setattr(llm_module, "translate_summary", stub_translate)
+
+    client = TestClient(app)
+    first = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "es"})
+    second = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "es"})
+    other = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "fr"})
+
+    assert first.status_code == second.status_code == other.status_code == 200
+    assert "cached" not in first.json()["meta"]
+    assert second.json()["translation"] == "Hola"
+    assert second.json()["meta"]["cached"] is True
+    assert calls == ["es", "fr"]
+
+
+def test_translate_cache_hit_reports_its_own_cost(monkeypatch):
+    from app.services import llm as llm_module
+
+    async def stub_translate(text: str, *, target_language: str, language_label: str):  # type: ignore
+        return "Hola", {"ok": True, "usage": {"total_tokens": 99}, "duration_ms": 1234}
+
+    monkeypatch.setattr(llm_module, "translate_summary", stub_translate)
+
+    client = TestClient(app)
+    first = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "es"}).json()["meta"]
+    second = client.post("/api/v1/translate", json={"text": "Hello", "target_language": "es"}).json()["meta"]
+
+    assert first["usage"] == {"total_tokens": 99}
+    assert first["attempts"] == 1
+    assert "usage" not in second
+    assert second["attempts"] == 0
+    assert second["duration_ms"] < 1234
+    assert second["cached"] is True